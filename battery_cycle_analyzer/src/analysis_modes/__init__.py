@@ -6,12 +6,32 @@ This package contains different analysis mode implementations:
 - standard_cycle: Standard cycle capacity and retention analysis
 - dqdu_analysis: Differential capacity (dQ/dU) analysis
 - combined_analysis: Combined standard and dQ/dU analysis
+
+Submodules are imported lazily on first attribute access, so importing one
+mode does not pull in the dependencies of the others.
 """
 
-from .standard_cycle import StandardCycleAnalyzer
-from .dqdu_analysis import compute_dqdu_analysis
+import importlib
+
+# Public name -> (submodule, attribute); new analysis modes register here
+_MODULE_MAP = {
+    'StandardCycleAnalyzer': ('.standard_cycle', 'StandardCycleAnalyzer'),
+    'compute_dqdu_analysis': ('.dqdu_analysis', 'compute_dqdu_analysis'),
+}
+
+__all__ = list(_MODULE_MAP)
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _MODULE_MAP[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    obj = getattr(importlib.import_module(module_name, __name__), attr)
+    # Cache in module globals so __getattr__ is not hit again
+    globals()[name] = obj
+    return obj
+
 
-__all__ = [
-    'StandardCycleAnalyzer',
-    'compute_dqdu_analysis'
-]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,86 +7,163 @@ which is useful for identifying phase transitions and degradation mechanisms.
 
 import numpy as np
 import pandas as pd
-from scipy import interpolate, signal
-from scipy.ndimage import uniform_filter1d, gaussian_filter1d
+from scipy import signal
+from scipy.integrate import cumulative_trapezoid
+from scipy.ndimage import convolve1d, uniform_filter1d, gaussian_filter1d
 from typing import Dict, List, Tuple, Optional, Any
+from functools import lru_cache
 import logging
 
+logger = logging.getLogger(__name__)
 
-def extract_cycle_data(df: pd.DataFrame, cycle_number: int, half_cycle_type: str, 
-                      cycle_boundaries: List[Tuple[int, int]]) -> pd.DataFrame:
+# Capacity columns tried for each half-cycle type, in order of preference
+CAPACITY_COLUMNS = {
+    'discharge': ('Ah[Ah]', 'Ah-Cyc-Discharge-0', 'Ah-Cyc-Discharge'),
+    'charge': ('Ah[Ah]', 'Ah-Cyc-Charge-0', 'Ah-Cyc-Charge')
+}
+
+
+def _column_array(df: pd.DataFrame, col: str) -> np.ndarray:
+    """Return a DataFrame column as a float64 array, coercing non-numeric values to NaN."""
+    try:
+        return df[col].to_numpy(dtype=np.float64)
+    except (ValueError, TypeError):
+        return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _encode_commands(command: pd.Series) -> Tuple[np.ndarray, Dict[str, int],
+                                                  Tuple[np.ndarray, np.ndarray]]:
     """
-    Extract specific half-cycle data for dQ/dU analysis using preprocessed boundaries.
+    Encode the Command column as integer codes of its lowercased values.
+    
+    Goes through a Categorical, so strings are only lowercased once per
+    distinct command instead of once per row.
     
     Args:
-        df: Main dataframe with battery data
+        command: Command column
+        
+    Returns:
+        Tuple of (codes, {lowercased command: code}, pause runs).
+        Missing commands get code -1. Pause runs is a pair of arrays
+        (run_start, run_end): run_start[i] is the row after the last
+        non-pause row at or before i, run_end[i] the first non-pause row
+        at or after i (len(command) if none), so extending a range over
+        adjacent pause/rest rows is a lookup.
+    """
+    categorical = command.astype('category')
+    lowered_codes, lowered = pd.factorize(categorical.cat.categories.str.lower())
+    # Trailing -1 maps the categorical's missing-value code (-1) to -1
+    codes = np.append(lowered_codes, -1)[categorical.cat.codes.to_numpy()]
+    vocab = {name: code for code, name in enumerate(lowered)}
+    pause_codes = [vocab[name] for name in ('pause', 'rest') if name in vocab]
+    is_pause = np.isin(codes, pause_codes)
+    
+    positions = np.arange(len(codes))
+    run_start = np.maximum.accumulate(np.where(is_pause, 0, positions + 1))
+    run_end = np.minimum.accumulate(np.where(is_pause, len(codes), positions)[::-1])[::-1]
+    return codes, vocab, (run_start, run_end)
+
+
+def _extract_cycle_rows(voltage: np.ndarray, commands: np.ndarray,
+                        command_vocab: Dict[str, int],
+                        pause_runs: Tuple[np.ndarray, np.ndarray],
+                        cycle_number: int, half_cycle_type: str,
+                        cycle_boundaries: List[Tuple[int, int]]) -> np.ndarray:
+    """
+    Locate the rows of a half-cycle for dQ/dU analysis.
+    
+    Works on column arrays only, so callers can gather just the columns they
+    need instead of slicing the whole DataFrame.
+    
+    Args:
+        voltage: U[V] column as an array
+        commands: Command codes from _encode_commands
+        command_vocab: Lowercased command to code mapping from _encode_commands
+        pause_runs: Pause run boundaries from _encode_commands
         cycle_number: Cycle number to extract (1-indexed)
         half_cycle_type: 'charge' or 'discharge'
         cycle_boundaries: Pre-computed cycle boundaries from preprocessing
         
     Returns:
-        DataFrame with the extracted cycle data
+        Array of positional row indices of the half-cycle
         
     Raises:
         ValueError: If cycle number is invalid or no data found for the specified phase
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
     # Validate cycle number
     if not (0 < cycle_number <= len(cycle_boundaries)):
         raise ValueError(f"Invalid cycle number {cycle_number}. Available: 1-{len(cycle_boundaries)}")
     
     # Get cycle boundaries
     start_idx, end_idx = cycle_boundaries[cycle_number - 1]  # Convert to 0-indexed
-    cycle_data = df.iloc[start_idx:end_idx + 1].copy()
-    
-    # Check for adjacent pause/rest periods to capture full voltage range
-    if start_idx > 0 and df.iloc[start_idx - 1]['Command'].lower() in ['pause', 'rest']:
-        pause_start = start_idx - 1
-        while pause_start > 0 and df.iloc[pause_start - 1]['Command'].lower() in ['pause', 'rest']:
-            pause_start -= 1
-        start_idx = pause_start
-        cycle_data = df.iloc[start_idx:end_idx + 1].copy()
-    
-    if end_idx < len(df) - 1 and df.iloc[end_idx + 1]['Command'].lower() in ['pause', 'rest']:
-        pause_end = end_idx + 1
-        while pause_end < len(df) - 1 and df.iloc[pause_end + 1]['Command'].lower() in ['pause', 'rest']:
-            pause_end += 1
-        end_idx = pause_end
-        cycle_data = df.iloc[start_idx:end_idx + 1].copy()
+    
+    # Extend over adjacent pause/rest periods to capture full voltage range
+    run_start, run_end = pause_runs
+    if 0 < start_idx <= len(run_start):
+        start_idx = int(run_start[start_idx - 1])
+    if end_idx + 1 < len(run_end):
+        end_idx = int(run_end[end_idx + 1]) - 1
     
     # Filter to the specific half-cycle type
-    filtered_data = cycle_data[cycle_data['Command'].str.lower() == half_cycle_type.lower()].copy()
+    half_cycle = half_cycle_type.lower()
+    target_code = command_vocab.get(half_cycle, -2)  # -2 matches no row
+    rows = start_idx + np.flatnonzero(commands[start_idx:end_idx + 1] == target_code)
 
-    if filtered_data.empty:
+    if len(rows) == 0:
         raise ValueError(f"No {half_cycle_type} data found in cycle {cycle_number}")
 
     # Enforce voltage monotonicity: trim tail where voltage reverses direction.
     # Transition rows at phase boundaries can cause the voltage to briefly
     # move in the wrong direction, creating spike artifacts in dQ/dU.
-    voltage_vals = filtered_data['U[V]'].values
-    if half_cycle_type.lower() == 'charge':
+    voltage_vals = voltage[rows]
+    if half_cycle == 'charge':
         # Charge: voltage should increase. Trim after last occurrence of max voltage
         # (last occurrence preserves constant-voltage plateaus).
         v_max_idx = np.where(voltage_vals == voltage_vals.max())[0][-1]
         if v_max_idx < len(voltage_vals) - 1:
-            filtered_data = filtered_data.iloc[:v_max_idx + 1].copy()
-            logger.debug(f"Trimmed {len(voltage_vals) - v_max_idx - 1} declining points "
-                        f"after charge voltage peak")
+            logger.debug("Trimmed %d declining points after charge voltage peak",
+                         len(voltage_vals) - v_max_idx - 1)
+            rows = rows[:v_max_idx + 1]
+            voltage_vals = voltage_vals[:v_max_idx + 1]
     else:
         # Discharge: voltage should decrease. Trim after last occurrence of min voltage
         # (last occurrence preserves constant-voltage plateaus).
         v_min_idx = np.where(voltage_vals == voltage_vals.min())[0][-1]
         if v_min_idx < len(voltage_vals) - 1:
-            filtered_data = filtered_data.iloc[:v_min_idx + 1].copy()
-            logger.debug(f"Trimmed {len(voltage_vals) - v_min_idx - 1} rising points "
-                        f"after discharge voltage minimum")
+            logger.debug("Trimmed %d rising points after discharge voltage minimum",
+                         len(voltage_vals) - v_min_idx - 1)
+            rows = rows[:v_min_idx + 1]
+            voltage_vals = voltage_vals[:v_min_idx + 1]
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Cycle %d (%s): %d points, V=[%.3f, %.3f]", cycle_number, half_cycle_type,
+                    len(rows), voltage_vals.min(), voltage_vals.max())
 
-    logger.info(f"Cycle {cycle_number} ({half_cycle_type}): {len(filtered_data)} points, "
-                f"V=[{filtered_data['U[V]'].min():.3f}, {filtered_data['U[V]'].max():.3f}]")
+    return rows
 
-    return filtered_data
+
+def extract_cycle_data(df: pd.DataFrame, cycle_number: int, half_cycle_type: str, 
+                      cycle_boundaries: List[Tuple[int, int]]) -> pd.DataFrame:
+    """
+    Extract specific half-cycle data for dQ/dU analysis using preprocessed boundaries.
+    
+    Args:
+        df: Main dataframe with battery data
+        cycle_number: Cycle number to extract (1-indexed)
+        half_cycle_type: 'charge' or 'discharge'
+        cycle_boundaries: Pre-computed cycle boundaries from preprocessing
+        
+    Returns:
+        DataFrame with the extracted cycle data
+        
+    Raises:
+        ValueError: If cycle number is invalid or no data found for the specified phase
+    """
+    commands, command_vocab, pause_runs = _encode_commands(df['Command'])
+    rows = _extract_cycle_rows(_column_array(df, 'U[V]'), commands, command_vocab, pause_runs,
+                               cycle_number, half_cycle_type, cycle_boundaries)
+    # Positional take already returns a new frame, no extra copy needed
+    return df.iloc[rows]
 
 
 def interpolate_voltage_capacity(voltage: np.ndarray, capacity: np.ndarray, 
@@ -102,95 +179,134 @@ def interpolate_voltage_capacity(voltage: np.ndarray, capacity: np.ndarray,
     Returns:
         Tuple of (interpolated_voltage, interpolated_capacity)
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
     # Ensure arrays are numeric (convert from object dtype if needed)
     try:
         voltage = np.asarray(voltage, dtype=np.float64)
         capacity = np.asarray(capacity, dtype=np.float64)
     except (ValueError, TypeError) as e:
-        logger.error(f"Could not convert to numeric - V dtype: {voltage.dtype}, C dtype: {capacity.dtype}")
-        logger.error(f"Sample voltage values: {voltage[:5] if len(voltage) > 0 else 'empty'}")
-        logger.error(f"Sample capacity values: {capacity[:5] if len(capacity) > 0 else 'empty'}")
+        logger.error("Could not convert to numeric - V dtype: %s, C dtype: %s", voltage.dtype, capacity.dtype)
+        logger.error("Sample voltage values: %s", voltage[:5] if len(voltage) > 0 else 'empty')
+        logger.error("Sample capacity values: %s", capacity[:5] if len(capacity) > 0 else 'empty')
         raise ValueError(f"Could not convert data to numeric: {e}")
     
-    # Remove any NaN values
-    mask = ~(np.isnan(voltage) | np.isnan(capacity))
-    voltage = voltage[mask]
-    capacity = capacity[mask]
+    # Remove any NaN/inf values; clean data (the usual case) is not copied
+    mask = np.isfinite(voltage)
+    mask &= np.isfinite(capacity)
+    if not mask.all():
+        voltage = voltage[mask]
+        capacity = capacity[mask]
     
     if len(voltage) < 2:
-        logger.error(f"Insufficient data points for interpolation: {len(voltage)}")
+        logger.error("Insufficient data points for interpolation: %d", len(voltage))
         raise ValueError("Insufficient data points for interpolation")
     
-    # Sort by voltage for interpolation
-    sort_idx = np.argsort(voltage)
-    voltage_sorted = voltage[sort_idx]
-    capacity_sorted = capacity[sort_idx]
-    
-    # Remove duplicates
-    unique_mask = np.diff(voltage_sorted, prepend=-np.inf) > 1e-10
+    # Sort by voltage for interpolation. Half-cycles are usually monotonic,
+    # in which case a (reversed) view avoids the argsort and gather
+    voltage_steps = np.diff(voltage)
+    reversed_order = False
+    if (voltage_steps >= 0).all():
+        voltage_sorted, capacity_sorted = voltage, capacity
+    elif (voltage_steps <= 0).all():
+        voltage_sorted, capacity_sorted = voltage[::-1], capacity[::-1]
+        voltage_steps = -voltage_steps[::-1]
+        reversed_order = True
+    else:
+        # np.unique sorts and drops exact duplicates in one call, keeping the
+        # first occurrence of each voltage
+        voltage_sorted, first_idx = np.unique(voltage, return_index=True)
+        capacity_sorted = capacity[first_idx]
+        voltage_steps = np.diff(voltage_sorted)
+    
+    # Remove duplicates (within 1e-10 V), keeping the earliest sample of each
+    # tied run; after reversing, that is the last element of the run
+    unique_mask = np.empty(len(voltage_sorted), dtype=bool)
+    if reversed_order:
+        unique_mask[-1] = True
+        np.greater(voltage_steps, 1e-10, out=unique_mask[:-1])
+    else:
+        unique_mask[0] = True
+        np.greater(voltage_steps, 1e-10, out=unique_mask[1:])
     voltage_unique = voltage_sorted[unique_mask]
     capacity_unique = capacity_sorted[unique_mask]
     
     if len(voltage_unique) < 2:
-        logger.error(f"Insufficient unique voltage points: {len(voltage_unique)}")
+        logger.error("Insufficient unique voltage points: %d", len(voltage_unique))
         raise ValueError("Insufficient unique voltage points for interpolation")
     
     # Create uniform voltage grid
     v_min, v_max = voltage_unique.min(), voltage_unique.max()
     v_interp = np.linspace(v_min, v_max, n_points)
     
-    logger.info(f"Interpolating: {len(voltage_unique)} unique points to {n_points} points")
-    logger.info(f"Voltage range: {v_min:.3f} to {v_max:.3f} V")
-    logger.info(f"Capacity range: {capacity_unique.min():.6f} to {capacity_unique.max():.6f} Ah")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Interpolating: %d unique points to %d points", len(voltage_unique), n_points)
+        logger.debug("Voltage range: %.3f to %.3f V", v_min, v_max)
+        logger.debug("Capacity range: %.6f to %.6f Ah", capacity_unique.min(), capacity_unique.max())
     
-    # Interpolate capacity - use linear for stability
-    interp_func = interpolate.interp1d(voltage_unique, capacity_unique, 
-                                       kind='linear', bounds_error=False, 
-                                       fill_value='extrapolate')
-    q_interp = interp_func(v_interp)
+    # Interpolate capacity - use linear for stability. The grid spans exactly
+    # the data range, so no extrapolation is needed
+    q_interp = np.interp(v_interp, voltage_unique, capacity_unique)
     
     return v_interp, q_interp
 
 
 def calculate_dq_du(voltage: np.ndarray, capacity: np.ndarray, 
                     smoothing: Optional[Dict] = None, 
-                    phase_type: str = 'discharge') -> np.ndarray:
+                    phase_type: str = 'discharge',
+                    active_mass: float = 1.0) -> np.ndarray:
     """
     Calculate differential capacity dQ/dU.
     
     Args:
-        voltage: Voltage data (should be uniformly spaced)
+        voltage: Voltage data (must be uniformly spaced, at least 2 points)
         capacity: Capacity data (in Ah)
         smoothing: Optional smoothing parameters
         phase_type: 'charge' or 'discharge' for sign convention
+        active_mass: Active material weight in g; if positive, dQ/dU is
+            normalized by it
         
     Returns:
-        dQ/dU values array (in mAh/V)
+        dQ/dU values array (in mAh/V, or mAh/g/V when normalized)
     """
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Convert capacity to mAh first for better numerical stability with small batteries
-    capacity_mah = capacity * 1000  # Convert Ah to mAh
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Capacity range for dQ/dU: %.3f to %.3f mAh",
+                    capacity.min() * 1000, capacity.max() * 1000)
     
-    logger.info(f"Capacity range for dQ/dU: {capacity_mah.min():.3f} to {capacity_mah.max():.3f} mAh")
-    
-    # Apply smoothing to capacity before differentiation if requested
-    if smoothing:
-        capacity_mah = apply_smoothing(capacity_mah, smoothing)
-    
-    # Calculate numerical derivative dQ/dV
-    dv = np.gradient(voltage)
-    dq = np.gradient(capacity_mah)  # Already in mAh
+    # Voltage grid is uniform, so the step is a single scalar
+    dv = (voltage[-1] - voltage[0]) / (len(voltage) - 1)
     
     # Avoid division by zero - use a larger threshold for voltage differences
-    dv[np.abs(dv) < 1e-6] = 1e-6
-    
-    # Calculate dQ/dU (differential capacity) - already in mAh/V
-    dq_du = dq / dv
+    if abs(dv) < 1e-6:
+        dv = 1e-6
+    
+    # Fold the Ah -> mAh conversion and active mass normalization into the
+    # derivative's scale factor instead of extra passes over the array
+    mass = active_mass if active_mass > 0 else 1.0
+    if active_mass > 0:
+        logger.debug("Normalizing dQ/dU by active mass %.4f g", active_mass)
+    
+    savgol = None
+    if smoothing and smoothing.get('method', 'savgol') in SAVGOL_METHODS:
+        savgol = _savgol_window(smoothing, len(capacity))
+    
+    if savgol is not None and savgol[1] >= 1:
+        # Savitzky-Golay gives the derivative of the local polynomial fit
+        # directly, in one convolution instead of smoothing then differencing
+        dq_du = _savgol_smooth(capacity, *savgol, deriv=1, delta=dv)
+        dq_du *= 1000.0 / mass
+    else:
+        # Apply smoothing to capacity before differentiation if requested.
+        # All smoothing methods are linear, so smoothing in Ah is equivalent to mAh
+        if smoothing:
+            capacity = apply_smoothing(capacity, smoothing)
+        
+        # Calculate dQ/dU (differential capacity).
+        # Central differences inside, one-sided at the ends (as np.gradient does)
+        scale = 1000.0 / (dv * mass)
+        dq_du = np.empty_like(capacity)
+        np.subtract(capacity[2:], capacity[:-2], out=dq_du[1:-1])
+        dq_du[1:-1] *= 0.5 * scale
+        dq_du[0] = (capacity[1] - capacity[0]) * scale
+        dq_du[-1] = (capacity[-1] - capacity[-2]) * scale
     
     # Sign convention: after sorting by voltage ascending and interpolating,
     # the natural dQ/dU sign is already correct:
@@ -199,13 +315,75 @@ def calculate_dq_du(voltage: np.ndarray, capacity: np.ndarray,
     # We do NOT use np.abs() here because it would mask real zero-crossings
     # at the voltage extremes and create artifacts.
     
-    # Check for reasonable values
-    if np.all(np.abs(dq_du) < 1e-6):
+    # Check for reasonable values (threshold is 1e-6 mAh/V before normalization)
+    if np.all(np.abs(dq_du) < 1e-6 / mass):
         logger.warning("All dQ/dU values are near zero - check capacity data")
     
     return dq_du
 
 
+# Smoothing method names that select Savitzky-Golay
+SAVGOL_METHODS = ('savgol', 'savitzky_golay', 'savitzky-golay')
+
+
+def _savgol_window(params: Dict, n_points: int) -> Optional[Tuple[int, int]]:
+    """
+    Resolve a valid Savitzky-Golay (window, poly) pair from smoothing parameters.
+    
+    Returns:
+        (window, poly), or None if the data is too short to smooth
+    """
+    window = params.get('window_size', params.get('window', 11))
+    poly = params.get('poly', 3)
+    # Ensure window is odd
+    if window % 2 == 0:
+        window += 1
+    # Ensure we have enough points
+    if n_points <= window:
+        return None
+    # Ensure poly < window (savgol requires window > polyorder)
+    if poly >= window:
+        poly = window - 1
+    return window, poly
+
+
+@lru_cache(maxsize=16)
+def _savgol_kernels(window: int, poly: int, deriv: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Savitzky-Golay coefficients for a (window, poly, deriv) triple, cached across cycles.
+    
+    Returns:
+        Tuple of (convolution coefficients, edge-fit matrix). Row p of the
+        edge-fit matrix evaluates (the deriv-th derivative of) the polynomial
+        fitted to a window at position p. Both assume unit sample spacing.
+    """
+    conv_coeffs = signal.savgol_coeffs(window, poly, deriv=deriv)
+    edge_fit = np.array([signal.savgol_coeffs(window, poly, deriv=deriv, pos=pos, use='dot')
+                         for pos in range(window)])
+    return conv_coeffs, edge_fit
+
+
+def _savgol_smooth(data: np.ndarray, window: int, poly: int,
+                   deriv: int = 0, delta: float = 1.0) -> np.ndarray:
+    """Equivalent of signal.savgol_filter(data, window, poly, deriv, delta) using cached kernels."""
+    data = np.asarray(data, dtype=np.float64)
+    conv_coeffs, edge_fit = _savgol_kernels(window, poly, deriv)
+    if window >= 31 and len(data) >= 10000:
+        # Long traces with wide windows: FFT convolution is O(N log N) rather than O(N*W)
+        smoothed = signal.fftconvolve(data, conv_coeffs, mode='same')
+    else:
+        smoothed = convolve1d(data, conv_coeffs, mode='constant')
+    # savgol_filter's default 'interp' mode replaces the edges with a polynomial
+    # fitted to the first/last window of points
+    half = window // 2
+    if half:
+        smoothed[:half] = edge_fit[:half] @ data[:window]
+        smoothed[-half:] = edge_fit[-half:] @ data[-window:]
+    if deriv:
+        smoothed /= delta ** deriv
+    return smoothed
+
+
 def apply_smoothing(data: np.ndarray, params: Dict) -> np.ndarray:
     """
     Apply smoothing to data based on specified method.
@@ -224,19 +402,11 @@ def apply_smoothing(data: np.ndarray, params: Dict) -> np.ndarray:
         
     method = params.get('method', 'savgol')
     
-    if method in ('savgol', 'savitzky_golay', 'savitzky-golay'):
-        window = params.get('window_size', params.get('window', 11))
-        poly = params.get('poly', 3)
-        # Ensure window is odd
-        if window % 2 == 0:
-            window += 1
-        # Ensure we have enough points
-        if len(data) <= window:
+    if method in SAVGOL_METHODS:
+        savgol = _savgol_window(params, len(data))
+        if savgol is None:
             return data
-        # Ensure poly < window (savgol requires window > polyorder)
-        if poly >= window:
-            poly = window - 1
-        return signal.savgol_filter(data, window, poly)
+        return _savgol_smooth(data, *savgol)
 
     elif method in ('moving_avg', 'moving average'):
         window = params.get('window', 5)
@@ -265,24 +435,27 @@ def detect_peaks(dq_du: np.ndarray, voltage: np.ndarray,
         prominence: Minimum prominence for peak detection
         
     Returns:
-        Dictionary with peak information
+        Dictionary with peak information as NumPy arrays
     """
     # Find peaks
     peaks, properties = signal.find_peaks(dq_du, prominence=prominence)
     
-    if len(peaks) == 0:
-        return {
-            'peak_indices': [],
-            'peak_voltages': [],
-            'peak_intensities': [],
-            'prominences': []
-        }
-    
     return {
-        'peak_indices': peaks.tolist(),
-        'peak_voltages': voltage[peaks].tolist(),
-        'peak_intensities': dq_du[peaks].tolist(),
-        'prominences': properties['prominences'].tolist()
+        'peak_indices': peaks,
+        'peak_voltages': voltage[peaks],
+        'peak_intensities': dq_du[peaks],
+        'prominences': properties['prominences']
+    }
+
+
+def _cycle_error_result(cycle_num: int, half_cycle_type: str, error: Exception) -> Dict:
+    """Build the result entry reported for a cycle that could not be analyzed."""
+    return {
+        'error': str(error),
+        'metadata': {
+            'cycle_number': cycle_num,
+            'half_cycle_type': half_cycle_type
+        }
     }
 
 
@@ -309,75 +482,103 @@ def compute_dqdu_analysis(df: pd.DataFrame, cycle_selections: List[Tuple[int, st
     """
     results = {}
     
+    # Pull the columns used by the analysis out once as arrays; each cycle
+    # then gathers only these instead of slicing the whole DataFrame
+    try:
+        commands, command_vocab, pause_runs = _encode_commands(df['Command'])
+        used_cols = {'U[V]', 'Time[h]', 'I[A]'}.union(*CAPACITY_COLUMNS.values())
+        columns = {col: _column_array(df, col) for col in used_cols if col in df.columns}
+        voltage_all = columns['U[V]']
+    except Exception as e:
+        # Unusable input (e.g. missing Command or U[V]) fails every cycle
+        logger.warning("Failed to prepare dQ/dU analysis: %s", e)
+        for cycle_num, half_cycle_type in cycle_selections:
+            results[f"cycle_{cycle_num}_{half_cycle_type}"] = _cycle_error_result(
+                cycle_num, half_cycle_type, e)
+        return results
+    
+    # Resolve which capacity columns exist once; the schema is the same for every cycle
+    capacity_candidates = {phase: tuple(col for col in cols if col in columns)
+                           for phase, cols in CAPACITY_COLUMNS.items()}
+    
     # First pass: collect voltage ranges if we need a common range
     # Only apply common range if explicitly enabled AND no manual voltage range is set
     voltage_ranges = []
+    cycle_rows: Dict[Tuple[int, str], np.ndarray] = {}  # reused by the main loop
     has_manual_range = params.get('voltage_range') is not None
     if params.get('use_common_voltage_range', False) and not has_manual_range:
         for cycle_num, half_cycle_type in cycle_selections:
             try:
-                cycle_data = extract_cycle_data(df, cycle_num, half_cycle_type, cycle_boundaries)
-                voltage = cycle_data['U[V]'].values
+                rows = _extract_cycle_rows(voltage_all, commands, command_vocab, pause_runs,
+                                           cycle_num, half_cycle_type, cycle_boundaries)
+                cycle_rows[(cycle_num, half_cycle_type)] = rows
+                voltage = voltage_all[rows]
                 voltage_ranges.append((voltage.min(), voltage.max()))
             except Exception:
                 pass
 
         if voltage_ranges:
             # Find the common voltage range (intersection of all ranges)
-            common_v_min = max(v_min for v_min, _ in voltage_ranges)
-            common_v_max = min(v_max for _, v_max in voltage_ranges)
+            ranges = np.asarray(voltage_ranges)
+            common_v_min = float(ranges[:, 0].max())
+            common_v_max = float(ranges[:, 1].min())
             if common_v_min >= common_v_max:
-                logging.warning(f"Common voltage range is empty ({common_v_min:.3f} >= {common_v_max:.3f} V), skipping")
+                logger.warning("Common voltage range is empty (%.3f >= %.3f V), skipping",
+                               common_v_min, common_v_max)
             else:
-                logging.info(f"Using common voltage range: {common_v_min:.3f} to {common_v_max:.3f} V")
+                logger.info("Using common voltage range: %.3f to %.3f V", common_v_min, common_v_max)
                 params = params.copy()
                 params['voltage_range'] = (common_v_min, common_v_max)
     
     for cycle_num, half_cycle_type in cycle_selections:
         try:
-            # Extract cycle data
-            cycle_data = extract_cycle_data(df, cycle_num, half_cycle_type, cycle_boundaries)
+            # Locate cycle rows, unless the common-range pass already did
+            rows = cycle_rows.get((cycle_num, half_cycle_type))
+            if rows is None:
+                rows = _extract_cycle_rows(voltage_all, commands, command_vocab, pause_runs,
+                                           cycle_num, half_cycle_type, cycle_boundaries)
             
             # Get voltage and capacity data
-            voltage = cycle_data['U[V]'].values
+            voltage = voltage_all[rows]
             
             # Try different capacity column names - prioritize absolute capacity
-            capacity_cols = {
-                'discharge': ['Ah[Ah]', 'Ah-Cyc-Discharge-0', 'Ah-Cyc-Discharge'],
-                'charge': ['Ah[Ah]', 'Ah-Cyc-Charge-0', 'Ah-Cyc-Charge']
-            }
-            
             capacity = None
-            for col in capacity_cols[half_cycle_type.lower()]:
-                if col in cycle_data.columns:
-                    raw_capacity = cycle_data[col].values
-                    
-                    # For absolute capacity column, calculate relative capacity within cycle
-                    if col == 'Ah[Ah]':
-                        # Calculate relative capacity from start of cycle
-                        capacity = np.abs(raw_capacity - raw_capacity[0])
-                        logging.info(f"Using absolute capacity column {col}, range: {raw_capacity[0]:.6f} to {raw_capacity[-1]:.6f}")
-                        logging.info(f"Capacity range for {half_cycle_type}: {capacity.min():.6f} to {capacity.max():.6f} Ah")
-                    else:
-                        # Cycle-specific columns should already be relative
-                        capacity = np.abs(raw_capacity)
-                        logging.info(f"Using cycle capacity column {col}, max: {capacity.max():.6f}")
-                    
-                    # Check if we have reasonable capacity values (for small batteries)
-                    # For 50 mAh/g with 0.035g = 1.75 mAh = 0.00175 Ah theoretical
-                    if capacity.max() < 1e-7:  # Less than 0.0001 mAh - truly too small
-                        logging.warning(f"Very small capacity values in {col}: max={capacity.max():.9f} Ah")
-                        continue  # Try next column
-                    
-                    logging.info(f"Selected capacity column: {col}")
-                    break
+            for col in capacity_candidates[half_cycle_type.lower()]:
+                # The gather is a fresh copy, so it can be transformed in place
+                capacity = columns[col][rows]
+                
+                # For absolute capacity column, calculate relative capacity within cycle
+                if col == 'Ah[Ah]':
+                    # Calculate relative capacity from start of cycle
+                    raw_start, raw_end = capacity[0], capacity[-1]
+                    capacity -= raw_start
+                    np.abs(capacity, out=capacity)
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info("Using absolute capacity column %s, range: %.6f to %.6f",
+                                    col, raw_start, raw_end)
+                        logger.info("Capacity range for %s: %.6f to %.6f Ah",
+                                    half_cycle_type, capacity.min(), capacity.max())
+                else:
+                    # Cycle-specific columns should already be relative
+                    np.abs(capacity, out=capacity)
+                    logger.info("Using cycle capacity column %s, max: %.6f", col, capacity.max())
+                
+                # Check if we have reasonable capacity values (for small batteries)
+                # For 50 mAh/g with 0.035g = 1.75 mAh = 0.00175 Ah theoretical
+                capacity_max = capacity.max()
+                if capacity_max < 1e-7:  # Less than 0.0001 mAh - truly too small
+                    logger.warning("Very small capacity values in %s: max=%.9f Ah", col, capacity_max)
+                    continue  # Try next column
+                
+                logger.info("Selected capacity column: %s", col)
+                break
             
             if capacity is None:
                 # Fallback: integrate current over time
-                logging.info("No capacity column found, integrating current over time")
-                time_h = cycle_data['Time[h]'].values
-                current = np.abs(cycle_data['I[A]'].values)
-                capacity = np.cumsum(current * np.gradient(time_h))
+                logger.info("No capacity column found, integrating current over time")
+                time_h = columns['Time[h]'][rows]
+                current = np.abs(columns['I[A]'][rows])
+                capacity = cumulative_trapezoid(current, time_h, initial=0.0)
             
             # Apply voltage filtering if specified
             if params.get('voltage_range'):
@@ -393,38 +594,34 @@ def compute_dqdu_analysis(df: pd.DataFrame, cycle_selections: List[Tuple[int, st
             )
             
             # Log data ranges for debugging
-            try:
-                v_min = float(voltage.min())
-                v_max = float(voltage.max())
-                c_min = float(capacity.min())
-                c_max = float(capacity.max())
-                logging.info(f"Cycle {cycle_num} ({half_cycle_type}): "
-                            f"V range: {v_min:.2f}-{v_max:.2f} V, "
-                            f"Q range: {c_min:.6f}-{c_max:.6f} Ah, "
-                            f"Points: {len(voltage)}")
-            except (ValueError, TypeError) as e:
-                logging.error(f"Data type issue - V dtype: {voltage.dtype}, C dtype: {capacity.dtype}")
-                logging.error(f"Sample values - V: {voltage[:3]}, C: {capacity[:3]}")
+            if logger.isEnabledFor(logging.INFO):
+                try:
+                    v_min = float(voltage.min())
+                    v_max = float(voltage.max())
+                    c_min = float(capacity.min())
+                    c_max = float(capacity.max())
+                    logger.info("Cycle %d (%s): V range: %.2f-%.2f V, Q range: %.6f-%.6f Ah, Points: %d",
+                                cycle_num, half_cycle_type, v_min, v_max, c_min, c_max, len(voltage))
+                except (ValueError, TypeError) as e:
+                    logger.error("Data type issue - V dtype: %s, C dtype: %s", voltage.dtype, capacity.dtype)
+                    logger.error("Sample values - V: %s, C: %s", voltage[:3], capacity[:3])
             
-            # Calculate dQ/dU
+            # Calculate dQ/dU, normalized by active material weight to get mAh/g/V
             smoothing = params.get('smoothing')
+            active_mass = params.get('active_material_weight', 1.0)  # Default 1g if not provided
             # Only pass smoothing if it's not None/none
             if smoothing and smoothing.get('method', 'none').lower() != 'none':
-                dq_du = calculate_dq_du(v_interp, q_interp, smoothing, phase_type=half_cycle_type)
+                dq_du = calculate_dq_du(v_interp, q_interp, smoothing, phase_type=half_cycle_type,
+                                        active_mass=active_mass)
             else:
-                dq_du = calculate_dq_du(v_interp, q_interp, None, phase_type=half_cycle_type)
-
-            # Normalize by active material weight to get mAh/g/V
-            active_mass = params.get('active_material_weight', 1.0)  # Default 1g if not provided
-            if active_mass > 0:
-                dq_du = dq_du / active_mass
-                logging.debug(f"Normalized dQ/dU by active mass {active_mass:.4f} g")
+                dq_du = calculate_dq_du(v_interp, q_interp, None, phase_type=half_cycle_type,
+                                        active_mass=active_mass)
 
             # Check if dQ/dU has valid values
             if np.all(np.isnan(dq_du)) or len(dq_du) == 0:
-                logging.warning(f"All dQ/dU values are NaN for cycle {cycle_num}")
-            else:
-                logging.info(f"dQ/dU range: {np.nanmin(dq_du):.4f} to {np.nanmax(dq_du):.4f}")
+                logger.warning("All dQ/dU values are NaN for cycle %d", cycle_num)
+            elif logger.isEnabledFor(logging.INFO):
+                logger.info("dQ/dU range: %.4f to %.4f", np.nanmin(dq_du), np.nanmax(dq_du))
             
             # Detect peaks if enabled
             peaks = None
@@ -433,9 +630,9 @@ def compute_dqdu_analysis(df: pd.DataFrame, cycle_selections: List[Tuple[int, st
                 peaks = detect_peaks(dq_du, v_interp, prominence)
             
             results[f"cycle_{cycle_num}_{half_cycle_type}"] = {
-                'voltage': v_interp.tolist(),
-                'capacity': q_interp.tolist(),
-                'dq_du': dq_du.tolist(),
+                'voltage': v_interp,
+                'capacity': q_interp,
+                'dq_du': dq_du,
                 'peaks': peaks,
                 'metadata': {
                     'cycle_number': cycle_num,
@@ -448,14 +645,9 @@ def compute_dqdu_analysis(df: pd.DataFrame, cycle_selections: List[Tuple[int, st
             }
             
         except Exception as e:
-            logging.warning(f"Failed to analyze cycle {cycle_num} ({half_cycle_type}): {str(e)}")
-            results[f"cycle_{cycle_num}_{half_cycle_type}"] = {
-                'error': str(e),
-                'metadata': {
-                    'cycle_number': cycle_num,
-                    'half_cycle_type': half_cycle_type
-                }
-            }
+            logger.warning("Failed to analyze cycle %s (%s): %s", cycle_num, half_cycle_type, e)
+            results[f"cycle_{cycle_num}_{half_cycle_type}"] = _cycle_error_result(
+                cycle_num, half_cycle_type, e)
     
     return results
 
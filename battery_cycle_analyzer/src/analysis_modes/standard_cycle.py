@@ -10,6 +10,20 @@ from core.data_models import (
     AnalysisResults
 )
 
+# Layout shared by all cycle-number plots
+_BASE_LAYOUT = dict(
+    xaxis_title='Cycle Number',
+    hovermode='x unified'
+)
+
+# Above this many cycles, traces render with WebGL instead of SVG
+SCATTERGL_MIN_POINTS = 1000
+
+
+def _scatter_type(n_points: int):
+    """Pick go.Scattergl for long cycle series, go.Scatter otherwise"""
+    return go.Scattergl if n_points > SCATTERGL_MIN_POINTS else go.Scatter
+
 
 class StandardCycleAnalyzer:
     """Performs standard cycle analysis"""
@@ -24,27 +38,23 @@ class StandardCycleAnalyzer:
     ) -> AnalysisResults:
         """Run standard cycle analysis"""
         
-        cycle_data = preprocessed_data.cycle_metadata.copy()
+        cycle_metadata = preprocessed_data.cycle_metadata
         
-        if cycle_data.empty:
+        if cycle_metadata.empty:
             return AnalysisResults(
                 mode="standard",
                 warnings=["No cycles found in data"]
             )
         
         # Calculate retention relative to baseline cycle
+        # (use first cycle as baseline if it is out of range)
         baseline_cycle = preprocessed_data.parameters.baseline_cycle
-        if baseline_cycle <= len(cycle_data):
-            baseline_capacity = cycle_data.iloc[baseline_cycle - 1]['Specific_Discharge_mAhg']
-            cycle_data['Retention_%'] = (
-                cycle_data['Specific_Discharge_mAhg'] / baseline_capacity * 100
-            )
-        else:
-            # Use first cycle as baseline
-            baseline_capacity = cycle_data.iloc[0]['Specific_Discharge_mAhg']
-            cycle_data['Retention_%'] = (
-                cycle_data['Specific_Discharge_mAhg'] / baseline_capacity * 100
-            )
+        baseline_row = baseline_cycle - 1 if baseline_cycle <= len(cycle_metadata) else 0
+        discharge = cycle_metadata['Specific_Discharge_mAhg'].to_numpy()
+        # assign() returns a new frame, leaving the preprocessed metadata untouched
+        cycle_data = cycle_metadata.assign(**{
+            'Retention_%': discharge / discharge[baseline_row] * 100
+        })
         
         # Calculate summary statistics
         summary_stats = self._calculate_summary_stats(cycle_data)
@@ -70,19 +80,29 @@ class StandardCycleAnalyzer:
     def _calculate_summary_stats(self, cycle_data: pd.DataFrame) -> Dict[str, Any]:
         """Calculate summary statistics"""
         
+        # All column means in a single reduction
+        means = cycle_data[[
+            'Specific_Discharge_mAhg',
+            'Specific_Charge_mAhg',
+            'Efficiency_%',
+            'Voltage_Max',
+            'Voltage_Min'
+        ]].mean()
+        final_retention = (
+            cycle_data['Retention_%'].iat[-1] if 'Retention_%' in cycle_data else None
+        )
+        
         return {
             'total_cycles': len(cycle_data),
-            'avg_discharge_capacity_mAhg': cycle_data['Specific_Discharge_mAhg'].mean(),
-            'avg_charge_capacity_mAhg': cycle_data['Specific_Charge_mAhg'].mean(),
-            'avg_efficiency_%': cycle_data['Efficiency_%'].mean(),
-            'final_retention_%': cycle_data['Retention_%'].iloc[-1] if 'Retention_%' in cycle_data else None,
+            'avg_discharge_capacity_mAhg': means['Specific_Discharge_mAhg'],
+            'avg_charge_capacity_mAhg': means['Specific_Charge_mAhg'],
+            'avg_efficiency_%': means['Efficiency_%'],
+            'final_retention_%': final_retention,
             'capacity_fade_per_cycle_%': (
-                (100 - cycle_data['Retention_%'].iloc[-1]) / len(cycle_data)
-                if 'Retention_%' in cycle_data else None
-            ),
-            'avg_voltage_range_V': (
-                cycle_data['Voltage_Max'].mean() - cycle_data['Voltage_Min'].mean()
+                (100 - final_retention) / len(cycle_data)
+                if final_retention is not None else None
             ),
+            'avg_voltage_range_V': means['Voltage_Max'] - means['Voltage_Min'],
             'total_test_duration_h': cycle_data['Duration_h'].sum()
         }
     
@@ -122,8 +142,9 @@ class StandardCycleAnalyzer:
         """Create capacity vs cycle plot"""
         
         fig = go.Figure()
+        scatter = _scatter_type(len(cycle_data))
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=cycle_data['Cycle'],
             y=cycle_data['Specific_Discharge_mAhg'],
             mode='lines+markers',
@@ -132,7 +153,7 @@ class StandardCycleAnalyzer:
             marker=dict(size=4)
         ))
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=cycle_data['Cycle'],
             y=cycle_data['Specific_Charge_mAhg'],
             mode='lines+markers',
@@ -142,10 +163,9 @@ class StandardCycleAnalyzer:
         ))
         
         fig.update_layout(
+            **_BASE_LAYOUT,
             title='Specific Capacity vs Cycle Number',
-            xaxis_title='Cycle Number',
             yaxis_title='Specific Capacity (mAh/g)',
-            hovermode='x unified',
             showlegend=True
         )
         
@@ -155,8 +175,9 @@ class StandardCycleAnalyzer:
         """Create retention vs cycle plot"""
         
         fig = go.Figure()
+        scatter = _scatter_type(len(cycle_data))
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=cycle_data['Cycle'],
             y=cycle_data['Retention_%'],
             mode='lines+markers',
@@ -174,10 +195,9 @@ class StandardCycleAnalyzer:
         )
         
         fig.update_layout(
+            **_BASE_LAYOUT,
             title='Capacity Retention vs Cycle Number',
-            xaxis_title='Cycle Number',
             yaxis_title='Retention (%)',
-            hovermode='x unified',
             yaxis=dict(range=[0, 105])
         )
         
@@ -187,8 +207,9 @@ class StandardCycleAnalyzer:
         """Create efficiency vs cycle plot"""
         
         fig = go.Figure()
+        scatter = _scatter_type(len(cycle_data))
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=cycle_data['Cycle'],
             y=cycle_data['Efficiency_%'],
             mode='lines+markers',
@@ -198,10 +219,9 @@ class StandardCycleAnalyzer:
         ))
         
         fig.update_layout(
+            **_BASE_LAYOUT,
             title='Coulombic Efficiency vs Cycle Number',
-            xaxis_title='Cycle Number',
             yaxis_title='Efficiency (%)',
-            hovermode='x unified',
             yaxis=dict(range=[0, 105])
         )
         
@@ -211,8 +231,9 @@ class StandardCycleAnalyzer:
         """Create voltage range vs cycle plot"""
         
         fig = go.Figure()
+        scatter = _scatter_type(len(cycle_data))
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=cycle_data['Cycle'],
             y=cycle_data['Voltage_Max'],
             mode='lines',
@@ -221,7 +242,7 @@ class StandardCycleAnalyzer:
             fill=None
         ))
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=cycle_data['Cycle'],
             y=cycle_data['Voltage_Min'],
             mode='lines',
@@ -232,10 +253,9 @@ class StandardCycleAnalyzer:
         ))
         
         fig.update_layout(
+            **_BASE_LAYOUT,
             title='Voltage Range vs Cycle Number',
-            xaxis_title='Cycle Number',
             yaxis_title='Voltage (V)',
-            hovermode='x unified',
             showlegend=True
         )
         
@@ -248,12 +268,10 @@ class StandardCycleAnalyzer:
     ) -> pd.DataFrame:
         """Prepare data for CSV export"""
         
-        export_df = cycle_data.copy()
-        
-        # Add metadata as columns
-        export_df['Test_Name'] = metadata.test_name
-        export_df['Battery'] = metadata.battery_name
-        export_df['Test_Start'] = metadata.test_start
-        export_df['Test_End'] = metadata.test_end
-        
-        return export_df
\ No newline at end of file
+        # Add metadata as columns (assign returns a new frame)
+        return cycle_data.assign(
+            Test_Name=metadata.test_name,
+            Battery=metadata.battery_name,
+            Test_Start=metadata.test_start,
+            Test_End=metadata.test_end
+        )
\ No newline at end of file
@@ -87,7 +87,12 @@ class DataPreprocessor:
             unique_commands = df[command_col].unique()
             self.logger.info(f"Unique commands in data: {unique_commands[:10]}")
 
-            df_filtered = df[df[command_col].str.lower().isin(['charge', 'discharge'])].copy()
+            # Lowercase and match the distinct commands only, then map back
+            # through the integer category codes
+            commands = df[command_col].astype('category')
+            is_cycling = commands.cat.categories.str.lower().isin(['charge', 'discharge'])
+            keep = np.append(is_cycling, False)[commands.cat.codes.to_numpy()]
+            df_filtered = df[keep]
             if len(df_filtered) == 0:
                 self.logger.warning(f"No charge/discharge data found after filtering. Command column '{command_col}' has values: {unique_commands[:10]}")
                 return []
@@ -283,80 +288,115 @@ class DataPreprocessor:
         if has_precalc_capacity:
             self.logger.info("Using pre-calculated capacity columns (Ah-Cyc-Discharge, Ah-Cyc-Charge)")
 
-        cycle_data = []
-
-        for idx, (start_idx, end_idx) in enumerate(boundaries):
-            cycle_df = df.iloc[start_idx:end_idx + 1]
-
-            # Get cycle number - use actual from data if available, otherwise use 1-based index
-            if use_data_cycle_numbers and len(cycle_df) > 0:
-                cycle_num = int(cycle_df['Cyc'].iloc[0])
-            else:
-                cycle_num = idx + 1
-
-            # Calculate capacities - use pre-calculated if available, otherwise integrate
-            if has_precalc_capacity:
-                # Use max value of pre-calculated capacity columns within this cycle
-                discharge_capacity = cycle_df['Ah-Cyc-Discharge'].max()
-                charge_capacity = cycle_df['Ah-Cyc-Charge'].max()
-
-                # Handle NaN values
-                if pd.isna(discharge_capacity):
-                    discharge_capacity = 0
-                if pd.isna(charge_capacity):
-                    charge_capacity = 0
-            else:
-                # Integrate current over time (original method)
-                discharge_mask = cycle_df[current_col] < 0
-                charge_mask = cycle_df[current_col] > 0
-
-                discharge_df = cycle_df[discharge_mask]
-                charge_df = cycle_df[charge_mask]
-
-                discharge_capacity = 0
-                charge_capacity = 0
-
-                if len(discharge_df) > 1:
-                    time_h = discharge_df[time_col].values
-                    current_a = np.abs(discharge_df[current_col].values)
-                    discharge_capacity = np.trapezoid(current_a, time_h)
-
-                if len(charge_df) > 1:
-                    time_h = charge_df[time_col].values
-                    current_a = np.abs(charge_df[current_col].values)
-                    charge_capacity = np.trapezoid(current_a, time_h)
-
+        # Pull the columns out once; each cycle is then a positional slice
+        # of these arrays instead of a sub-DataFrame
+        current = df[current_col].to_numpy()
+        time_h = df[time_col].to_numpy()
+
+        n_cycles = len(boundaries)
+        n_total = len(df)
+        start_indices = np.array([start for start, _ in boundaries])
+        end_indices = np.array([end for _, end in boundaries])
+        starts = np.clip(start_indices, 0, n_total)
+        stops = np.clip(end_indices + 1, 0, n_total)
+        has_rows = stops > starts
+
+        # Get cycle numbers - use actual from data if available, otherwise use 1-based index
+        cycle_numbers = np.arange(1, n_cycles + 1)
+        if use_data_cycle_numbers and n_total > 0:
+            first_cyc = df['Cyc'].to_numpy()[np.minimum(starts, n_total - 1)]
+            cycle_numbers = np.where(has_rows, first_cyc, cycle_numbers).astype(int)
+
+        # Calculate capacities - use pre-calculated if available, otherwise integrate
+        if has_precalc_capacity:
+            # Use max value of pre-calculated capacity columns within this cycle,
+            # treating NaN (no data) as zero
+            discharge_capacity = np.nan_to_num(
+                self._segment_reduce(np.fmax, df['Ah-Cyc-Discharge'].to_numpy(), starts, stops), nan=0.0)
+            charge_capacity = np.nan_to_num(
+                self._segment_reduce(np.fmax, df['Ah-Cyc-Charge'].to_numpy(), starts, stops), nan=0.0)
+        else:
+            # Integrate current over time (original method)
+            discharge_capacity = np.zeros(n_cycles)
+            charge_capacity = np.zeros(n_cycles)
+
+            for idx in range(n_cycles):
+                cycle_current = current[starts[idx]:stops[idx]]
+                cycle_time = time_h[starts[idx]:stops[idx]]
+                discharge_mask = cycle_current < 0
+                charge_mask = cycle_current > 0
+
+                if np.count_nonzero(discharge_mask) > 1:
+                    current_a = np.abs(cycle_current[discharge_mask])
+                    discharge_capacity[idx] = np.trapezoid(current_a, cycle_time[discharge_mask])
+
+                if np.count_nonzero(charge_mask) > 1:
+                    current_a = np.abs(cycle_current[charge_mask])
+                    charge_capacity[idx] = np.trapezoid(current_a, cycle_time[charge_mask])
+
+        # Get C-rates for each cycle
+        c_rate_charge = np.full(n_cycles, 0.333)  # Default
+        c_rate_discharge = np.full(n_cycles, 0.333)  # Default
+
+        # Apply ranges last-to-first so the first matching range wins
+        for start_c, end_c, charge_rate, discharge_rate in reversed(parameters.c_rates):
+            in_range = (cycle_numbers >= start_c) & (cycle_numbers <= end_c)
+            c_rate_charge[in_range] = charge_rate
+            c_rate_discharge[in_range] = discharge_rate
+
+        # Per-cycle extrema for all cycles at once (NaN-skipping, like pandas)
+        voltage = df[voltage_col].to_numpy()
+        voltage_min = self._segment_reduce(np.fmin, voltage, starts, stops)
+        voltage_max = self._segment_reduce(np.fmax, voltage, starts, stops)
+        duration = (self._segment_reduce(np.fmax, time_h, starts, stops) -
+                    self._segment_reduce(np.fmin, time_h, starts, stops))
+
+        # Efficiency is only defined where charge capacity is positive
+        efficiency = np.divide(discharge_capacity, charge_capacity,
+                               out=np.zeros(n_cycles), where=charge_capacity > 0) * 100
+
+        return pd.DataFrame({
+            'Cycle': cycle_numbers,
+            'Start_Index': start_indices,
+            'End_Index': end_indices,
+            'Discharge_Capacity_Ah': discharge_capacity,
+            'Charge_Capacity_Ah': charge_capacity,
             # Calculate specific capacity
-            specific_discharge = (discharge_capacity * 1000) / parameters.active_material_weight
-            specific_charge = (charge_capacity * 1000) / parameters.active_material_weight
-
-            # Get C-rates for this cycle
-            c_rate_charge = 0.333  # Default
-            c_rate_discharge = 0.333  # Default
-
-            for start_c, end_c, charge_rate, discharge_rate in parameters.c_rates:
-                if start_c <= cycle_num <= end_c:
-                    c_rate_charge = charge_rate
-                    c_rate_discharge = discharge_rate
-                    break
-
-            cycle_data.append({
-                'Cycle': cycle_num,
-                'Start_Index': start_idx,
-                'End_Index': end_idx,
-                'Discharge_Capacity_Ah': discharge_capacity,
-                'Charge_Capacity_Ah': charge_capacity,
-                'Specific_Discharge_mAhg': specific_discharge,
-                'Specific_Charge_mAhg': specific_charge,
-                'Efficiency_%': (discharge_capacity / charge_capacity * 100) if charge_capacity > 0 else 0,
-                'C_Rate_Charge': c_rate_charge,
-                'C_Rate_Discharge': c_rate_discharge,
-                'Voltage_Min': cycle_df[voltage_col].min() if len(cycle_df) > 0 else 0,
-                'Voltage_Max': cycle_df[voltage_col].max() if len(cycle_df) > 0 else 0,
-                'Duration_h': cycle_df[time_col].max() - cycle_df[time_col].min() if len(cycle_df) > 0 else 0
-            })
-
-        return pd.DataFrame(cycle_data)
+            'Specific_Discharge_mAhg': (discharge_capacity * 1000) / parameters.active_material_weight,
+            'Specific_Charge_mAhg': (charge_capacity * 1000) / parameters.active_material_weight,
+            'Efficiency_%': efficiency,
+            'C_Rate_Charge': c_rate_charge,
+            'C_Rate_Discharge': c_rate_discharge,
+            'Voltage_Min': np.where(has_rows, voltage_min, 0),
+            'Voltage_Max': np.where(has_rows, voltage_max, 0),
+            'Duration_h': np.where(has_rows, duration, 0)
+        })
+
+    @staticmethod
+    def _segment_reduce(
+        ufunc: np.ufunc,
+        values: np.ndarray,
+        starts: np.ndarray,
+        stops: np.ndarray
+    ) -> np.ndarray:
+        """Reduce values[start:stop] for every segment in one reduceat call
+
+        Args:
+            ufunc: Binary ufunc to reduce with (np.fmin/np.fmax skip NaNs)
+            values: Column values
+            starts: Segment start positions
+            stops: Segment stop positions (exclusive, at most len(values))
+
+        Returns:
+            One reduced value per segment, NaN for empty segments
+        """
+        # Trailing NaN makes stop == len(values) a valid reduceat index;
+        # every other result is a start:stop segment
+        padded = np.append(np.asarray(values, dtype=float), np.nan)
+        indices = np.column_stack((starts, stops)).ravel()
+        result = ufunc.reduceat(padded, indices)[::2]
+        result[stops <= starts] = np.nan
+        return result
     
     def _validate_data_quality(
         self,
@@ -5,6 +5,7 @@ Handles parsing of battery test data files with various formats and encodings.
 Specializes in handling Basytec format with special considerations for DateTime fields.
 """
 
+import csv
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional, Tuple
@@ -172,17 +173,21 @@ class RawDataParser:
         # Find where data starts
         data_start_idx = RawDataParser._find_data_start(lines, skip_rows)
         
-        # Parse data rows
-        data_rows = RawDataParser._parse_data_rows(
-            lines[data_start_idx:], 
-            columns
-        )
+        # Parse data rows, tokenizing in pandas' C parser when the
+        # section is cleanly tab-separated
+        df = RawDataParser._parse_tab_separated(lines[data_start_idx:], columns)
         
-        if not data_rows:
-            raise ValueError("No valid data rows found in file")
-        
-        # Create DataFrame
-        df = pd.DataFrame(data_rows, columns=columns)
+        if df is None:
+            data_rows = RawDataParser._parse_data_rows(
+                lines[data_start_idx:], 
+                columns
+            )
+            
+            if not data_rows:
+                raise ValueError("No valid data rows found in file")
+            
+            # Create DataFrame
+            df = pd.DataFrame(data_rows, columns=columns)
         
         # Convert numeric columns
         df = RawDataParser._convert_numeric_columns(df)
@@ -244,6 +249,73 @@ class RawDataParser:
         
         return skip_rows
     
+    @staticmethod
+    def _parse_tab_separated(
+        lines: List[str], 
+        columns: List[str]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Parse data rows in bulk when every row is tab-separated
+        
+        Produces the same rows as _parse_data_rows, but splits the fields
+        in pandas' C parser instead of per line in Python. Numeric columns
+        are converted by the parser too, reading comma decimals directly;
+        a column it cannot convert is left as strings for
+        _convert_numeric_columns.
+        
+        Args:
+            lines: Data lines to parse
+            columns: Column names
+            
+        Returns:
+            DataFrame of parsed values, or None if any row needs the
+            line-by-line fallback (space-separated, split DateTime, ...)
+        """
+        # Join the stripped rows straight into one buffer without keeping
+        # an intermediate list of row strings
+        rows = (line.strip() for line in lines if not line.startswith('~'))
+        text = '\n'.join(row for row in rows if row)
+        
+        if not text:
+            return None
+        
+        # Every row must have exactly len(columns) - 1 tabs. The C parser
+        # rejects rows wider than the first one, so a matching total
+        # tab count means no row is narrower either.
+        n_rows = text.count('\n') + 1
+        if text.count('\t') != (len(columns) - 1) * n_rows:
+            return None
+        
+        # Numeric columns are typed by the parser; empty numeric fields
+        # become NaN, everything else stays the raw string
+        numeric_idx = [i for i, col in enumerate(columns)
+                       if col in RawDataParser.NUMERIC_COLUMNS]
+        first_row = text.split('\n', 1)[0].split('\t')
+        decimal = ',' if any(',' in first_row[i] for i in numeric_idx) else '.'
+        
+        try:
+            df = pd.read_csv(
+                StringIO(text),
+                sep='\t',
+                header=None,
+                dtype={i: object for i in range(len(columns)) if i not in numeric_idx},
+                decimal=decimal,
+                keep_default_na=False,
+                na_values={i: [''] for i in numeric_idx},
+                quoting=csv.QUOTE_NONE,
+                engine='c'
+            )
+        except (pd.errors.ParserError, ValueError, KeyError) as e:
+            logger.debug(f"Bulk tab-separated parse failed: {e}")
+            return None
+        
+        if df.shape != (n_rows, len(columns)):
+            return None
+        
+        df.columns = columns
+        logger.info(f"Parsed {len(df)} valid data rows")
+        return df
+    
     @staticmethod
     def _parse_data_rows(
         lines: List[str], 
@@ -413,7 +485,7 @@ class RawDataParser:
                 # First replace comma decimal separators with dots (European format)
                 # This is critical for Basytec data!
                 if df[col].dtype == object:  # Only for string columns
-                    df[col] = df[col].astype(str).str.replace(',', '.')
+                    df[col] = df[col].astype(str).str.replace(',', '.', regex=False)
                 df[col] = pd.to_numeric(df[col], errors='coerce')
         
         return df
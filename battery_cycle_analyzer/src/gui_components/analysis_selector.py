@@ -354,7 +354,7 @@ class AnalysisSelectorComponent:
                                 dqdu_wide_data[dq_col] = data['dq_du']
 
                                 # Add peak data if available
-                                if data.get('peaks') and data['peaks']['peak_indices']:
+                                if data.get('peaks') and len(data['peaks']['peak_indices']):
                                     for v, i, p in zip(
                                         data['peaks']['peak_voltages'],
                                         data['peaks']['peak_intensities'],
@@ -429,7 +429,7 @@ class AnalysisSelectorComponent:
                 ))
                 
                 # Add peaks if available
-                if data.get('peaks') and data['peaks']['peak_indices']:
+                if data.get('peaks') and len(data['peaks']['peak_indices']):
                     fig.add_trace(go.Scatter(
                         x=data['peaks']['peak_voltages'],
                         y=data['peaks']['peak_intensities'],
@@ -6,10 +6,16 @@ Handles venv setup, dependency installation, and application launch
 
 import os
 import sys
+import hashlib
 import subprocess
-import platform
 from pathlib import Path
 
+# Resolve project paths once; the in-process Streamlit launch changes the working directory
+PROJECT_ROOT = Path(__file__).resolve().parent
+VENV_PATH = PROJECT_ROOT / "venv"
+REQUIREMENTS_FILE = PROJECT_ROOT / "requirements.txt"
+IS_WINDOWS = sys.platform.startswith("win")
+
 # ANSI color codes for terminal output (cross-platform)
 class Colors:
     RED = '\033[91m'
@@ -45,6 +51,11 @@ def print_warning(message):
     """Print warning message in yellow"""
     print(f"{Colors.YELLOW}⚠ {message}{Colors.RESET}")
 
+def wait_for_exit():
+    """Keep the terminal open, unless running non-interactively"""
+    if sys.stdin is not None and sys.stdin.isatty() and not os.environ.get("BCA_NONINTERACTIVE"):
+        input("\nPress Enter to exit...")
+
 def check_python():
     """Check if Python is installed and version is adequate"""
     version = sys.version_info
@@ -54,31 +65,71 @@ def check_python():
     print_success(f"Found Python {version.major}.{version.minor}.{version.micro}")
     return True
 
-def get_venv_path():
-    """Get the virtual environment path"""
-    return Path.cwd() / "venv"
-
 def get_venv_python():
     """Get the Python executable in the virtual environment"""
-    venv_path = get_venv_path()
-    if platform.system() == "Windows":
-        return venv_path / "Scripts" / "python.exe"
+    if IS_WINDOWS:
+        return VENV_PATH / "Scripts" / "python.exe"
     else:
-        return venv_path / "bin" / "python"
+        return VENV_PATH / "bin" / "python"
 
 def get_venv_pip():
     """Get the pip executable in the virtual environment"""
-    venv_path = get_venv_path()
-    if platform.system() == "Windows":
-        return venv_path / "Scripts" / "pip.exe"
+    if IS_WINDOWS:
+        return VENV_PATH / "Scripts" / "pip.exe"
     else:
-        return venv_path / "bin" / "pip"
+        return VENV_PATH / "bin" / "pip"
+
+def get_venv_streamlit():
+    """Get the Streamlit entry-point script in the virtual environment"""
+    if IS_WINDOWS:
+        return VENV_PATH / "Scripts" / "streamlit.exe"
+    else:
+        return VENV_PATH / "bin" / "streamlit"
+
+def get_deps_marker():
+    """Get the marker file recording the installed requirements"""
+    return VENV_PATH / ".deps_ok"
+
+def get_requirements_hash():
+    """Hash requirements.txt so dependency changes trigger a reinstall"""
+    if not REQUIREMENTS_FILE.exists():
+        return "manual"
+    return hashlib.sha256(REQUIREMENTS_FILE.read_bytes()).hexdigest()
+
+def dependencies_installed():
+    """Check if dependencies were installed for the current requirements"""
+    marker = get_deps_marker()
+    return marker.exists() and marker.read_text().strip() == get_requirements_hash()
+
+def running_in_venv():
+    """Check if the launcher itself runs on the project venv interpreter"""
+    return Path(sys.prefix).resolve() == VENV_PATH.resolve()
+
+def run_streamlit_in_process(app_dir):
+    """Run Streamlit inside this interpreter, avoiding a second Python start"""
+    from streamlit.web import cli as stcli
+    
+    os.chdir(app_dir)
+    sys.argv = ["streamlit", "run", "src/gui_modular.py"]
+    try:
+        stcli.main()
+    except SystemExit as e:
+        return not e.code
+    return True
+
+def get_pip_install_options():
+    """Prefer prebuilt wheels, using a local wheelhouse if one is provided"""
+    options = ["--prefer-binary"]
+    wheelhouse = PROJECT_ROOT / "wheels"
+    if wheelhouse.is_dir():
+        options += ["--find-links", str(wheelhouse)]
+    return options
 
 def create_venv():
     """Create virtual environment"""
     print_info("Creating virtual environment...")
     try:
-        subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+        subprocess.run([sys.executable, "-m", "venv", str(VENV_PATH)], check=True)
         print_success("Virtual environment created")
         return True
     except subprocess.CalledProcessError:
@@ -96,17 +147,17 @@ def install_dependencies():
     # Upgrade pip first
     try:
         subprocess.run([str(venv_python), "-m", "pip", "install", "--upgrade", "pip"], 
-                      check=True, capture_output=True)
+                      check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         print_success("Pip upgraded")
     except subprocess.CalledProcessError:
         print_warning("Could not upgrade pip")
     
     # Install from requirements.txt if it exists
-    requirements_file = Path.cwd() / "requirements.txt"
-    if requirements_file.exists():
+    if REQUIREMENTS_FILE.exists():
         print_info("Installing from requirements.txt...")
         try:
-            subprocess.run([str(venv_pip), "install", "-r", "requirements.txt"], 
+            subprocess.run([str(venv_pip), "install", "-r", str(REQUIREMENTS_FILE),
+                           *get_pip_install_options()], 
                           check=True)
             print_success("Dependencies installed from requirements.txt")
             return True
@@ -127,25 +178,27 @@ def install_dependencies():
             "chardet"
         ]
         
-        for package in packages:
-            try:
-                print(f"  Installing {package}...")
-                subprocess.run([str(venv_pip), "install", package], 
-                             check=True, capture_output=True)
-            except subprocess.CalledProcessError:
-                print_error(f"Failed to install {package}")
-                return False
-        
+        # Single pip invocation so the resolver and startup cost are paid once
+        try:
+            print(f"  Installing {', '.join(packages)}...")
+            subprocess.run([str(venv_pip), "install", *packages, *get_pip_install_options()],
+                         check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                         text=True)
+        except subprocess.CalledProcessError as e:
+            print_error("Failed to install packages")
+            if e.stderr:
+                print(e.stderr.strip())
+            return False
+
         print_success("All dependencies installed")
         return True
 
 def run_application():
     """Run the Streamlit application"""
-    # Store the root venv python path before changing directories
     venv_python = get_venv_python()
     
-    # Navigate to battery_cycle_analyzer
-    app_dir = Path.cwd() / "battery_cycle_analyzer"
+    # Locate battery_cycle_analyzer (Streamlit runs with it as working directory)
+    app_dir = PROJECT_ROOT / "battery_cycle_analyzer"
     if not app_dir.exists():
         print_error("Cannot find battery_cycle_analyzer directory")
         return False
@@ -155,8 +208,6 @@ def run_application():
         print_error(f"Cannot find {app_file}")
         return False
     
-    os.chdir(app_dir)
-    
     print()
     print_success("Starting Battery Cycle Analyzer...")
     print()
@@ -168,12 +219,32 @@ def run_application():
     print("=" * 50)
     print()
     
+    if running_in_venv():
+        try:
+            return run_streamlit_in_process(app_dir)
+        except ImportError as e:
+            print_warning(f"Could not run Streamlit in-process ({e}), starting subprocess")
+    
+    # Prefer the entry-point script over 'python -m' to skip runpy
+    venv_streamlit = get_venv_streamlit()
+    if venv_streamlit.exists():
+        command = [str(venv_streamlit), "run", "src/gui_modular.py"]
+    else:
+        command = [str(venv_python), "-m", "streamlit", "run", "src/gui_modular.py"]
+    
     try:
-        # Run Streamlit using the venv python from root
-        subprocess.run([str(venv_python), "-m", "streamlit", "run", "src/gui_modular.py"])
-    except KeyboardInterrupt:
-        print()
-        print_info("Shutting down application...")
+        # Run Streamlit from the venv
+        process = subprocess.Popen(command, cwd=str(app_dir))
+        try:
+            process.wait()
+        except KeyboardInterrupt:
+            print()
+            print_info("Shutting down application...")
+            process.terminate()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
     except Exception as e:
         print_error(f"Error running application: {e}")
         return False
@@ -186,27 +257,31 @@ def main():
     
     # Check Python version
     if not check_python():
-        input("\nPress Enter to exit...")
+        wait_for_exit()
         sys.exit(1)
     
     print()
     
     # Check if venv exists
-    venv_path = get_venv_path()
     venv_python = get_venv_python()
     
-    if venv_path.exists() and venv_python.exists():
+    if VENV_PATH.exists() and venv_python.exists():
         print_success("Virtual environment found")
     else:
         print_info("No virtual environment found")
         if not create_venv():
-            input("\nPress Enter to exit...")
+            wait_for_exit()
             sys.exit(1)
-        
         print()
+    
+    # Install dependencies unless already done for this requirements.txt
+    if dependencies_installed():
+        print_success("Dependencies up to date")
+    else:
         if not install_dependencies():
-            input("\nPress Enter to exit...")
+            wait_for_exit()
             sys.exit(1)
+        get_deps_marker().write_text(get_requirements_hash())
         
         print()
         print("=" * 50)
@@ -215,7 +290,7 @@ def main():
     
     # Run the application
     if not run_application():
-        input("\nPress Enter to exit...")
+        wait_for_exit()
         sys.exit(1)
     
     print()
@@ -224,8 +299,8 @@ def main():
     print("=" * 50)
     
     # Keep terminal open on Windows
-    if platform.system() == "Windows":
-        input("\nPress Enter to exit...")
+    if IS_WINDOWS:
+        wait_for_exit()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file